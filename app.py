@@ -273,10 +273,11 @@ def serve_static(subpath):
 
 
 
-from pages import home, bids
+from pages import home, bids, fmriprep_index
 
 home.register_callbacks(app)
 bids.register_callbacks(app)
+fmriprep_index.start_watcher()
 
 
 
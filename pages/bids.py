@@ -306,8 +306,22 @@ def make_bids_info_panel(dataset_root, last_updated):
 # Layout
 # ---------------------------------------------------------------------
 
+_LAST_UPDATED = {"ts": None, "value": ""}
+
+
+def _get_last_updated():
+    """Dataset root mtime as display text; only re-formatted when the mtime changes."""
+    try:
+        ts = dataset_root.stat().st_mtime_ns
+    except OSError:
+        return "unknown"
+    if ts != _LAST_UPDATED["ts"]:
+        _LAST_UPDATED.update(ts=ts, value=datetime.fromtimestamp(ts / 1e9).strftime("%Y-%m-%d %H:%M"))
+    return _LAST_UPDATED["value"]
+
+
 def layout():
-    last_updated = datetime.fromtimestamp(dataset_root.stat().st_mtime).strftime("%Y-%m-%d %H:%M")
+    last_updated = _get_last_updated()
 
     return html.Div(
         className="page-transition",
@@ -95,8 +95,13 @@ DATA_ROOT = Path(S.dataset_root) / "derivatives" / "fmriprep"
 def layout(subject=None, **kwargs):
     subj_root = DATA_ROOT / subject
     # 🔧 fix: check both possible locations
-    html_reports = sorted(DATA_ROOT.glob(f"{subject}.html")) or sorted(subj_root.glob("*.html"))
+    html_reports = sorted(DATA_ROOT.glob(f"{subject}.html"))
+    report_prefix = "/fmriprep_files/"
+    if not html_reports:
+        html_reports = sorted(subj_root.glob("*.html"))
+        report_prefix = f"/fmriprep_files/{subject}/"
     fig_dir = subj_root / "figures"
+    fig_prefix = f"/fmriprep_files/{subject}/figures/"
 
     if not subj_root.exists() and not html_reports:
         return dbc.Container(
@@ -106,12 +111,11 @@ def layout(subject=None, **kwargs):
 
     report_links = []
     for f in html_reports:
-        rel = f.relative_to(DATA_ROOT)
         report_links.append(
             html.Li(
                 html.A(
                     f.name,
-                    href=f"/fmriprep_files/{rel}",
+                    href=report_prefix + f.name,
                     target="_blank",
                     style={"color": "#0d6efd", "textDecoration": "none"},
                 )
@@ -121,12 +125,11 @@ def layout(subject=None, **kwargs):
     fig_links = []
     if fig_dir.exists():
         for f in sorted(fig_dir.glob("*.svg")):
-            rel = f.relative_to(DATA_ROOT)
             fig_links.append(
                 html.Li(
                     html.A(
                         f.name,
-                        href=f"/fmriprep_files/{rel}",
+                        href=fig_prefix + f.name,
                         target="_blank",
                         style={"color": "#198754", "textDecoration": "none"},
                     )
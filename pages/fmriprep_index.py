@@ -1,9 +1,22 @@
 import dash
-from dash import html, dcc, Input, Output, callback
+from dash import html, dcc, Input, Output, State, callback, ctx
 import dash_bootstrap_components as dbc
 from pathlib import Path
 from flux_notebooks.config import Settings
+from flux_notebooks.cache.participants import load_participants
 from collections import defaultdict
+from functools import lru_cache
+import threading
+
+# Optional: push-based cache invalidation; without it we fall back to mtime checks
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+
+    _HAVE_WATCHDOG = True
+except Exception:
+    Observer = FileSystemEventHandler = None  # type: ignore[assignment]
+    _HAVE_WATCHDOG = False
 
 # ---------------------------------------------------------------------
 dash.register_page(__name__, path="/fmriprep", name="fMRIPrep Reports")
@@ -12,7 +25,6 @@ S = Settings.from_env()
 DATA_ROOT = Path(S.dataset_root) / "derivatives" / "fmriprep"
 BIDS_ROOT = Path(S.dataset_root) / "bids"
 PARTICIPANTS_TSV = BIDS_ROOT / "participants.tsv"
-import pandas as pd
 
 # ---------------------------------------------------------------------
 def list_htmls():
@@ -24,16 +36,29 @@ def list_htmls():
         sub = f.stem  # e.g. "sub-1359"
         ses = "main"
         modality = "fMRIPrep"
-        records.append(dict(sub=sub, ses=ses, modality=modality, path=f))
+        href = "/fmriprep_files/" + f.name  # reports are direct children of DATA_ROOT
+        records.append(dict(sub=sub, ses=ses, modality=modality, path=f, href=href))
 
     return records
 
 
+def _index_mtime():
+    """mtime_ns of the report folder and participants.tsv (0 when missing)."""
+    stamps = []
+    for p in (DATA_ROOT, PARTICIPANTS_TSV):
+        try:
+            stamps.append(p.stat().st_mtime_ns)
+        except OSError:
+            stamps.append(0)
+    return tuple(stamps)
 
 
+_INDEX_MTIME = _index_mtime()
 REPORTS = list_htmls()
 SUBJECTS = sorted(set(r["sub"] for r in REPORTS))
+_PARTICIPANTS = load_participants(PARTICIPANTS_TSV)
 MODALITIES = ["fMRIPrep"]
+PAGE_SIZE = 100  # subjects rendered per "Load more" step
 
 # ---------------------------------------------------------------------
 def color_for_modality(name):
@@ -42,38 +67,7 @@ def color_for_modality(name):
     return "#ccc"
 
 
-# def make_link(r):
-#     rel = r["path"].relative_to(DATA_ROOT)
-#     color = color_for_modality(r["modality"])
-#     return html.A(
-#         r["path"].name.replace(".html", ""),
-#         href=f"/fmriprep_files/{rel}",
-#         target="_blank",
-#         style={
-#             "display": "block",
-#             "margin": "2px 0",
-#             "color": color,
-#             "textDecoration": "none",
-#             "fontWeight": "500",
-#         },
-#     )
-
-
-# def make_link(r):
-#     rel = r["path"].relative_to(DATA_ROOT)
-#     return html.A(
-#         "Report",
-#         href=f"/fmriprep_files/{rel}",
-#         target="_blank",
-#         style={
-#             "display": "inline-block",
-#             "color": "#0d6efd",
-#             "textDecoration": "none",
-#             "fontWeight": "500",
-#         },
-#     )
 def make_link(r):
-    rel = r["path"].relative_to(DATA_ROOT)
     return html.A(
         dbc.Button(
             "View Report",
@@ -82,7 +76,7 @@ def make_link(r):
             className="mt-1",
             style={"fontWeight": "500", "textTransform": "none"},
         ),
-        href=f"/fmriprep_files/{rel}",
+        href=r["href"],
         target="_blank",
         style={"textDecoration": "none"},
     )
@@ -91,41 +85,6 @@ def make_link(r):
 
 
 # ---------------------------------------------------------------------
-# layout = dbc.Container(
-#     [
-#         html.H2("fMRIPrep Reports", className="mt-3 mb-2 text-center"),
-#         html.P(f"Dataset root: {S.dataset_root}", className="text-muted small text-center"),
-#         dbc.Row(
-#             [
-#                 dbc.Col(
-#                     dcc.Dropdown(
-#                         id="sub-filter",
-#                         options=[{"label": s, "value": s} for s in SUBJECTS],
-#                         placeholder="Filter by subject...",
-#                         multi=True,
-#                     ),
-#                     md=6,
-#                 ),
-#                 dbc.Col(
-#                     dcc.Input(
-#                         id="search",
-#                         type="text",
-#                         placeholder="Search reports...",
-#                         debounce=True,
-#                         className="form-control",
-#                     ),
-#                     md=6,
-#                 ),
-#             ],
-#             className="mb-4",
-#         ),
-#         html.Div(id="fmriprep-view"),
-#     ],
-#     fluid=True,
-# )
-
-
-
 layout = dbc.Container(
     [
         html.H2("fMRIPrep Reports", className="mt-4 mb-2 text-center fw-semibold"),
@@ -218,7 +177,23 @@ layout = dbc.Container(
         # --------------------------
         dbc.Row(
             dbc.Col(
-                html.Div(id="fmriprep-view"),
+                [
+                    html.Div(id="fmriprep-view"),
+                    html.Div(
+                        dbc.Button(
+                            "Load more",
+                            id="fmriprep-load-more",
+                            color="secondary",
+                            outline=True,
+                            size="sm",
+                            n_clicks=0,
+                        ),
+                        id="fmriprep-load-more-wrapper",
+                        className="text-center mt-3",
+                        style={"display": "none"},
+                    ),
+                    dcc.Store(id="fmriprep-limit", data=PAGE_SIZE),
+                ],
                 md=8,
                 className="mx-auto",
             ),
@@ -233,25 +208,56 @@ layout = dbc.Container(
 
 
 # ---------------------------------------------------------------------
+@callback(
+    Output("fmriprep-limit", "data"),
+    Input("fmriprep-load-more", "n_clicks"),
+    Input("site-filter", "value"),
+    Input("sub-filter", "value"),
+    Input("search", "value"),
+    State("fmriprep-limit", "data"),
+    prevent_initial_call=True,
+)
+def update_limit(n_clicks, site_filter, sub_filter, search_text, limit):
+    """Grow the page on "Load more"; any filter change starts again from the first page."""
+    if ctx.triggered_id == "fmriprep-load-more":
+        return (limit or PAGE_SIZE) + PAGE_SIZE
+    if limit == PAGE_SIZE:
+        return dash.no_update
+    return PAGE_SIZE
+
+
 @callback(
     Output("fmriprep-view", "children"),
+    Output("fmriprep-load-more-wrapper", "style"),
+    Output("fmriprep-load-more", "children"),
     Input("site-filter", "value"),
     Input("sub-filter", "value"),
     Input("search", "value"),
+    Input("fmriprep-limit", "data"),
 )
-def update_view(site_filter, sub_filter, search_text):
+def update_view(site_filter, sub_filter, search_text, limit):
+    _refresh_if_stale()
+    # Normalize inputs so equivalent filter combinations share one cache entry
+    subs_tuple = tuple(sorted(sub_filter)) if sub_filter else ()
+    view, remaining = _render_view(site_filter or None, subs_tuple, search_text or None, limit or PAGE_SIZE,
+                                   _GENERATION)
+    if remaining <= 0:
+        return view, {"display": "none"}, "Load more"
+    return view, {}, f"Load more ({remaining} remaining)"
+
+
+@lru_cache(maxsize=256)
+def _render_view(site_filter, sub_filter, search_text, limit=PAGE_SIZE, generation=0):
+    """Build the accordion for one filter combination (memoized; see update_view).
+
+    Only the first ``limit`` subjects are rendered; returns ``(component, n_remaining)``.
+    ``generation`` is the index generation the view is for (see _rebuild_index).
+    """
     reports = REPORTS
-    if site_filter and PARTICIPANTS_TSV.exists():
-        try:
-            df = pd.read_csv(PARTICIPANTS_TSV, sep="\t")
-            if "site_name" in df.columns and "participant_id" in df.columns:
-                subs_for_site = df.loc[
-                    df["site_name"].str.lower() == site_filter.lower(),
-                    "participant_id"
-                ].tolist()
-                reports = [r for r in reports if r["sub"] in subs_for_site]
-        except Exception as e:
-            print(f"[WARN] Site filter failed: {e}")
+    if site_filter and _PARTICIPANTS is not None:
+        df = _PARTICIPANTS
+        subs_for_site = set(df.loc[df["site_name_lc"] == site_filter.lower(), "participant_id"])
+        reports = [r for r in reports if r["sub"] in subs_for_site]
 
     if sub_filter:
         reports = [r for r in reports if r["sub"] in sub_filter]
@@ -260,14 +266,28 @@ def update_view(site_filter, sub_filter, search_text):
         reports = [r for r in reports if text in r["path"].name.lower()]
 
     if not reports:
-        return html.P("No fMRIPrep reports match your filters.", className="text-center text-muted")
+        return html.P("No fMRIPrep reports match your filters.", className="text-center text-muted"), 0
 
     grouped = defaultdict(lambda: defaultdict(list))
     for r in reports:
         grouped[r["sub"]][r["ses"]].append(r)
+    page = list(grouped.items())[:limit]
+    remaining = len(grouped) - len(page)
 
     items = []
-    for sub, sessions in grouped.items():
+    for sub, sessions in page:
+        title = html.A(
+            f"{sub} ({len(sessions)} sessions)",
+            href=f"/subject/{sub}",
+            style={"textDecoration": "none", "color": "#000"},
+        )
+
+        # Common case: one report per subject -> just the link, no Row/Col/CardBody wrappers
+        sub_reports = [r for ses_reports in sessions.values() for r in ses_reports]
+        if len(sub_reports) == 1:
+            items.append(dbc.AccordionItem(make_link(sub_reports[0]), title=title))
+            continue
+
         ses_names = sorted(sessions.keys())
         rows = []
         for modality in MODALITIES:
@@ -288,18 +308,9 @@ def update_view(site_filter, sub_filter, search_text):
 
 
         body = dbc.CardBody(rows)
-        items.append(
-            dbc.AccordionItem(
-                [body],
-                title=html.A(
-                    f"{sub} ({len(sessions)} sessions)",
-                    href=f"/subject/{sub}",
-                    style={"textDecoration": "none", "color": "#000"},
-                ),
-            )
-        )
+        items.append(dbc.AccordionItem([body], title=title))
 
-    return dbc.Card(
+    view = dbc.Card(
     dbc.CardBody(
         dbc.Accordion(items, start_collapsed=True, always_open=False),
         className="rounded-4 p-4",
@@ -318,6 +329,7 @@ def update_view(site_filter, sub_filter, search_text):
         "background": "linear-gradient(180deg, #fefefe 0%, #f9f9f9 100%)",
     },
 )
+    return view, remaining
 
 
 
@@ -329,16 +341,14 @@ def update_view(site_filter, sub_filter, search_text):
 )
 def update_subject_options(selected_site):
     """Populate subject dropdown dynamically from participants.tsv."""
+    _refresh_if_stale()
     try:
-        if not PARTICIPANTS_TSV.exists():
-            return [{"label": s, "value": s} for s in SUBJECTS]
-
-        df = pd.read_csv(PARTICIPANTS_TSV, sep="\t")
-        if "site_name" not in df.columns or "participant_id" not in df.columns:
+        df = _PARTICIPANTS
+        if df is None:
             return [{"label": s, "value": s} for s in SUBJECTS]
 
         if selected_site:
-            df = df[df["site_name"].str.lower() == selected_site.lower()]
+            df = df[df["site_name_lc"] == selected_site.lower()]
 
         subs = sorted(df["participant_id"].unique().tolist())
         return [{"label": s, "value": s} for s in subs]
@@ -346,3 +356,82 @@ def update_subject_options(selected_site):
         print(f"[WARN] update_subject_options failed: {e}")
         return [{"label": s, "value": s} for s in SUBJECTS]
 
+
+# ---------------------------------------------------------------------
+# Index invalidation
+# ---------------------------------------------------------------------
+_GENERATION = 0
+
+
+def _rebuild_index():
+    """Re-scan reports and participants.tsv, then move to a new index generation.
+
+    The generation is part of the _render_view key, so a view still being built from the
+    old index lands under the old generation and is never served again; clearing the
+    cache instead would let that in-flight call re-insert a stale view after the clear.
+    """
+    global REPORTS, SUBJECTS, _PARTICIPANTS, _INDEX_MTIME, _GENERATION
+    _INDEX_MTIME = _index_mtime()
+    REPORTS = list_htmls()
+    SUBJECTS = sorted(set(r["sub"] for r in REPORTS))
+    _PARTICIPANTS = load_participants(PARTICIPANTS_TSV)
+    _GENERATION += 1  # only after the new index is in place
+
+
+def _refresh_if_stale():
+    """Fallback when no watcher is running: rebuild if either input changed on disk."""
+    if not _WATCHING and _index_mtime() != _INDEX_MTIME:
+        _rebuild_index()
+
+
+_rebuild_timer = None
+
+
+def _schedule_rebuild():
+    """Debounce bursts of filesystem events into a single rebuild."""
+    global _rebuild_timer
+    if _rebuild_timer is not None:
+        _rebuild_timer.cancel()
+    _rebuild_timer = threading.Timer(1.0, _rebuild_index)
+    _rebuild_timer.daemon = True
+    _rebuild_timer.start()
+
+
+_WATCHING = False
+
+
+def start_watcher():
+    """Watch DATA_ROOT and participants.tsv (called once from app setup, not at import).
+
+    Returns False if watchdog is missing or nothing could be watched, in which case
+    update_view keeps falling back to mtime checks.
+    """
+    global _WATCHING
+    if _WATCHING or not _HAVE_WATCHDOG:
+        return _WATCHING
+
+    participants = str(PARTICIPANTS_TSV)
+
+    class _IndexHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            # Our own reads show up as open/close events; only changes matter
+            if event.event_type in ("opened", "closed_no_write"):
+                return
+            paths = (event.src_path, getattr(event, "dest_path", "") or "")
+            if any(p.endswith(".html") or p == participants for p in paths):
+                _schedule_rebuild()
+
+    observer = Observer()
+    observer.daemon = True
+    try:
+        watched = [d for d in (DATA_ROOT, BIDS_ROOT) if d.is_dir()]
+        for d in watched:
+            observer.schedule(_IndexHandler(), str(d), recursive=False)
+        if not watched:
+            return False
+        observer.start()
+    except Exception as e:
+        print(f"[WARN] File watcher unavailable, falling back to mtime checks: {e}")
+        return False
+    _WATCHING = True
+    return True
@@ -1,6 +1,7 @@
 import dash
 from dash import html
 from pathlib import Path
+from functools import lru_cache
 import os
 from flux_notebooks.freesurfer.summarize_freesurfer import summarize_freesurfer
 
@@ -8,9 +9,24 @@ dash.register_page(__name__, path="/freesurfer", name="FreeSurfer Summary")
 
 dataset_root = Path(os.environ.get("FLUX_DATASET_ROOT", "superdemo")).resolve()
 fs_root = dataset_root / "derivatives" / "freesurfer"
-summary = summarize_freesurfer(fs_root)
 
-layout = html.Div([
-    html.H2("FreeSurfer Summary"),
-    html.Pre(str(summary.keys())),
-])
+
+@lru_cache(maxsize=4)
+def _cached_summary(fs_root_str: str, mtime_ns: int):
+    """summarize_freesurfer() result, re-read only when the FreeSurfer root changes."""
+    return summarize_freesurfer(Path(fs_root_str))
+
+
+def _fs_mtime_ns():
+    try:
+        return fs_root.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def layout():
+    summary = _cached_summary(str(fs_root), _fs_mtime_ns())
+    return html.Div([
+        html.H2("FreeSurfer Summary"),
+        html.Pre(str(summary.keys())),
+    ])
@@ -1,157 +1,261 @@
 import dash
 from dash import html, dcc
 from pathlib import Path
+from functools import lru_cache
 import os
-import pandas as pd
-import plotly.graph_objs as go
+import threading
+import time
 from datetime import datetime
 import dash_bootstrap_components as dbc
 
-from flux_notebooks.redcap.summarize_targets import summarize_modalities
-from flux_notebooks.bids.summarize_bids import summarize_bids
-from flux_notebooks.freesurfer.summarize_freesurfer import summarize_freesurfer
 from flux_notebooks.theme import SITE_COLORS
+from flux_notebooks.cache.build_summary import (
+    SITE_MAP, MODALITIES, bids_signature, build_summary, load_summary, resolve_bids_root, write_summary,
+)
 
 dash.register_page(__name__, path="/", name="Home")
 
 # ---------------------------------------------------------------------
 # Site mapping and dataset paths
 # ---------------------------------------------------------------------
-SITE_MAP = {"montreal": "Montreal", "calgary": "Calgary", "toronto": "Toronto"}
-
-dataset_root = Path(os.environ.get("FLUX_DATASET_ROOT", "superdemo_real")).resolve()
-bids_root = (
-    dataset_root
-    if (dataset_root / "dataset_description.json").exists()
-    else (dataset_root / "bids")
-).resolve()
+# absolute() rather than resolve(): no per-component stat/readlink at import on network mounts.
+dataset_root = Path(os.environ.get("FLUX_DATASET_ROOT", "superdemo_real")).absolute()
+bids_root = resolve_bids_root(dataset_root)
 fs_root = dataset_root / "derivatives" / "freesurfer"
+# Plain strings for the per-request stat() calls and cache keys; no PurePath work per use.
+_DATASET_ROOT_STR = str(dataset_root)
+_BIDS_ROOT_STR = str(bids_root)
 
-# ---------------------------------------------------------------------
-# Inline CSS
-# ---------------------------------------------------------------------
-GLOBAL_STYLE = dcc.Markdown(
-    """
-    <style>
-    body {
-      font-family: 'Inter', sans-serif;
-      background-color: #f8f9fa;
-    }
-    .page-transition { animation: fadeSlideIn 0.6s ease-out forwards; }
-    @keyframes fadeSlideIn { from {opacity:0; transform:translateY(15px);} to {opacity:1; transform:translateY(0);} }
-    .card-fade { opacity:0; transform:translateY(10px); animation: fadeInUp 0.7s ease forwards; }
-    @keyframes fadeInUp { from {opacity:0; transform:translateY(15px);} to {opacity:1; transform:translateY(0);} }
-    .glass-card {
-      background: linear-gradient(145deg, #ffffff, #f3f3f3);
-      border: 1px solid rgba(255,255,255,0.25);
-      backdrop-filter: blur(8px);
-      border-radius: 12px;
-      box-shadow: 0 3px 6px rgba(0,0,0,0.08);
-      transition: transform 0.2s ease, box-shadow 0.2s ease;
-    }
-    .glass-card:hover { transform: translateY(-4px); box-shadow: 0 8px 18px rgba(0,0,0,0.15); }
-    .site-line { height: 4px; width: 40%; margin: 0 auto 15px; border-radius: 2px; }
-    </style>
-    """,
-    dangerously_allow_html=True,
-)
+_SITES = tuple(SITE_MAP.values())  # display labels, in page order
 
 # ---------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------
-def summarize_sessions(bids_root: Path, participants_file: Path):
-    """Count subjects by session and site."""
-    summary = {"baseline": {"sites": {}, "total": 0},
-               "followup1": {"sites": {}, "total": 0},
-               "followup2": {"sites": {}, "total": 0}}
-    if not bids_root.exists():
-        return summary
-    try:
-        df = pd.read_csv(participants_file, sep="\t")
-        site_lookup = dict(zip(df["participant_id"], df["site_name"]))
-    except Exception as e:
-        print(f"[WARN] Failed to load participants.tsv: {e}")
-        site_lookup = {}
-    for subdir in bids_root.glob("sub-*"):
-        if not subdir.is_dir(): continue
-        sub = subdir.name
-        site = site_lookup.get(sub, "Unknown")
-        sessions = [p.name for p in subdir.glob("ses-*") if p.is_dir()]
-        for ses in sessions:
-            key = {"ses-1a": "baseline", "ses-2a": "followup1", "ses-3a": "followup2"}.get(ses)
-            if not key: continue
-            summary[key]["total"] += 1
-            summary[key]["sites"][site] = summary[key]["sites"].get(site, 0) + 1
-    return summary
+@lru_cache(maxsize=8)
+def _cached_summary(dataset_root_str: str, bids_root_str: str, signature: str):
+    """Home-page counts for the BIDS root, as (session_summary, modality_percents).
+
+    Read from the precomputed summary file (see summary_path()) when it matches ``signature``
+    (see bids_signature()); otherwise scan live and refresh that file. ``signature`` is
+    also the memo key, so new subjects, sessions or scans get a fresh lookup.
+    """
+    summary = load_summary(Path(dataset_root_str), signature)
+    if summary is None:
+        summary = build_summary(Path(bids_root_str), signature)
+        try:
+            write_summary(Path(dataset_root_str), summary)
+        except OSError as e:
+            print(f"[WARN] Could not write summary cache: {e}")
+    return summary["sessions"], summary["percents"]
+
+
+_SUMMARY_LOCK = threading.Lock()
+
+
+def _summary(signature):
+    """_cached_summary() for this page's roots, one caller at a time.
+
+    Both lazy tabs ask for the summary on a cold load; the lock makes the second wait
+    for the first scan and then hit the memo instead of scanning the tree again.
+    """
+    with _SUMMARY_LOCK:
+        return _cached_summary(_DATASET_ROOT_STR, _BIDS_ROOT_STR, signature)
+
+
+def _pie_style(color):
+    """(color, card gradient, title style) for one donut color."""
+    return (color,
+            f"radial-gradient(circle at 30% 30%, {color}, {color}15, #f8f8f8)",
+            {"marginBottom": "4px", "color": color, "fontWeight": "600"})
+
+
+# Per-label donut styling, built once; labels without a site color (the "Overall" donuts) use the default.
+_PIE_STYLES = {label: _pie_style(color) for label, color in SITE_COLORS.items()}
+_PIE_DEFAULT_STYLE = _pie_style("#FFB300")
+_PIE_HOLE_STYLE = {"position": "absolute", "inset": "22.5%", "borderRadius": "50%",
+                   "background": "white", "display": "flex", "flexDirection": "column",
+                   "alignItems": "center", "justifyContent": "center",
+                   "fontFamily": "Inter, sans-serif", "color": "#111"}
+_PIE_CAPTION_STYLE = {"fontSize": "11px", "color": "#666"}
+_PIE_COUNT_STYLE = {"fontSize": "12px", "color": "#555"}
+_PIE_SHADOW = {True: "0 5px 14px rgba(0,0,0,0.15)", False: "0 3px 8px rgba(0,0,0,0.1)"}
 
 
+@lru_cache(maxsize=256)
 def make_pie(label, enrolled, target, emphasize=False):
-    """Single donut chart."""
+    """Single donut chart, drawn with a CSS conic-gradient (no Plotly).
+
+    Cached on its arguments: the result is a pure function of them and is only serialized, never mutated.
+    """
     enrolled_pct = round((enrolled / target * 100), 1) if target else 0
-    site_color = SITE_COLORS.get(label, "#FFB300")
-    fig = go.Figure()
-    fig.add_trace(go.Pie(
-        values=[enrolled, max(target - enrolled, 0)],
-        labels=["Enrolled", "Remaining"],
-        marker_colors=[site_color, "#E0E0E0"],
-        hole=0.55, sort=False, textinfo="none", showlegend=False))
+    fill_pct = min(enrolled_pct, 100)
+    site_color, gradient_color, title_style = _PIE_STYLES.get(label, _PIE_DEFAULT_STYLE)
     size_factor = 2.2 if emphasize else 1.0
-    base_size = 160
-    fig.update_traces(marker_line=dict(color="white", width=2))
-    fig.update_layout(
-        height=int(base_size * size_factor),
-        width=int(base_size * size_factor),
-        margin=dict(t=10, b=10, l=10, r=10),
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        annotations=[dict(
-            text=f"<b>{enrolled_pct:.1f}%</b><br><span style='font-size:11px;color:#666;'>enrolled</span>",
-            x=0.5, y=0.5, showarrow=False, align="center",
-            font=dict(size=int(18 * size_factor), color="#111", family="Inter, sans-serif"))])
-    gradient_color = f"radial-gradient(circle at 30% 30%, {site_color}, {site_color}15, #f8f8f8)"
+    size = int(140 * size_factor)
+    donut = html.Div(
+        title=f"Enrolled: {enrolled} / Remaining: {max(target - enrolled, 0)}",
+        style={"width": f"{size}px", "height": f"{size}px", "margin": "10px auto",
+               "borderRadius": "50%", "position": "relative",
+               "background": f"conic-gradient({site_color} 0 {fill_pct}%, #E0E0E0 {fill_pct}% 100%)"},
+        children=html.Div(
+            style=_PIE_HOLE_STYLE,
+            children=[
+                html.B(f"{enrolled_pct:.1f}%", style={"fontSize": f"{int(18 * size_factor)}px"}),
+                html.Span("enrolled", style=_PIE_CAPTION_STYLE),
+            ],
+        ),
+    )
     return html.Div(
         className="card-fade glass-card",
         style={"textAlign": "center", "margin": "10px", "padding": "12px",
                "borderRadius": "12px", "background": gradient_color,
-               "boxShadow": "0 5px 14px rgba(0,0,0,0.15)" if emphasize else "0 3px 8px rgba(0,0,0,0.1)"},
+               "boxShadow": _PIE_SHADOW[bool(emphasize)]},
         children=[
-            html.H5(label, style={"marginBottom": "4px", "color": site_color, "fontWeight": "600"}),
-            dcc.Graph(figure=fig, config={"displayModeBar": False}),
-            html.Div(f"{enrolled}/{target} enrolled", style={"fontSize": "12px", "color": "#555"}),
+            html.H5(label, style=title_style),
+            donut,
+            html.Div(f"{enrolled}/{target} enrolled", style=_PIE_COUNT_STYLE),
         ],
     )
 
+def _make_site_style(site_name):
+    """Style dicts for one site's modality card; shared between renders, never mutated."""
+    site_color = SITE_COLORS.get(site_name, "#444")
+    return {
+        "h4": {"textAlign": "center", "marginBottom": "12px", "color": site_color, "fontWeight": "600"},
+        "line": {"backgroundColor": site_color},
+        "pct_high": {"float": "right", "color": site_color},
+    }
+
+
+SITE_STYLE = {name: _make_site_style(name) for name in _SITES}
+_PCT_LOW_STYLE = {"float": "right", "color": "#888"}
+
+# Shared (never mutated) style dicts for the cards and rows below.
+_CARD_STYLE = {"padding": "35px 45px", "borderRadius": "16px", "minWidth": "360px",
+               "maxWidth": "420px", "minHeight": "260px", "textAlign": "left",
+               "boxShadow": "0 4px 16px rgba(0,0,0,0.12)",
+               "background": "linear-gradient(135deg, #ffffff 0%, #f7f7f7 100%)"}
+_LABEL_STYLE = {"fontWeight": "600"}
+_ROW_ACTIVE = {"marginBottom": "6px", "fontSize": "15px", "color": "#333"}
+_ROW_INACTIVE = {"marginBottom": "6px", "fontSize": "15px", "color": "#999"}
+_DONUT_ROW_STYLE = {"display": "flex", "justifyContent": "center",
+                    "gap": "45px", "flexWrap": "wrap", "marginTop": "25px"}
+_CARD_ROW_STYLE = {"display": "flex", "justifyContent": "center",
+                   "gap": "35px", "flexWrap": "wrap", "marginTop": "25px"}
+
+
+@lru_cache(maxsize=256)
+def _modality_rows(mod_items):
+    """(label, percent text, is_high, is_active) per displayed modality, from hashable (name, percent) pairs."""
+    percents = dict(mod_items)
+    rows = []
+    for label in MODALITIES:
+        val = percents.get(label, 0)
+        rows.append((label, f"{val:.1f}%", val >= 80, val > 0))
+    return tuple(rows)
+
 
 def make_modality_summary(mod_data, site_name=None):
-    site_color = SITE_COLORS.get(site_name, "#444")
-    modality_labels = ["T1W", "T2W", "task-partlycloudy", "task-laluna", "DWI"]
-    percents = {m["name"]: m.get("percent", 0) for m in mod_data.get("modalities", [])}
+    site_style = SITE_STYLE.get(site_name) or _make_site_style(site_name)
+    mod_items = tuple((m["name"], m.get("percent", 0)) for m in mod_data.get("modalities", []))
     rows = [
         html.Div(
-            [html.Span(label, style={"fontWeight": "600"}),
-             html.Span(f"{percents.get(label,0):.1f}%", style={"float": "right", "color": site_color if percents.get(label,0)>=80 else "#888"})],
-            style={"marginBottom": "6px", "fontSize": "15px", "color": "#333" if percents.get(label,0)>0 else "#999"})
-        for label in modality_labels
+            [html.Span(label, style=_LABEL_STYLE),
+             html.Span(pct_text, style=site_style["pct_high"] if high else _PCT_LOW_STYLE)],
+            style=_ROW_ACTIVE if active else _ROW_INACTIVE)
+        for label, pct_text, high, active in _modality_rows(mod_items)
     ]
     return html.Div(
         className="glass-card card-fade",
-        style={"padding": "35px 45px", "borderRadius": "16px", "minWidth": "360px",
-               "maxWidth": "420px", "minHeight": "260px", "textAlign": "left",
-               "boxShadow": "0 4px 16px rgba(0,0,0,0.12)",
-               "background": "linear-gradient(135deg, #ffffff 0%, #f7f7f7 100%)"},
+        style=_CARD_STYLE,
         children=[
-            html.H4(site_name, style={"textAlign": "center", "marginBottom": "12px",
-                                      "color": site_color, "fontWeight": "600"}),
-            html.Div(className="site-line", style={"backgroundColor": site_color}),
+            html.H4(site_name, style=site_style["h4"]),
+            html.Div(className="site-line", style=site_style["line"]),
             html.Div(rows),
         ],
     )
 
+
+TIMEPOINT_TABS = [("Baseline", "baseline"), ("Follow-up 1", "followup1"), ("Follow-up 2", "followup2")]
+MODALITY_TABS = [("Baseline", "1a"), ("Follow-up 1", "2a"), ("Follow-up 2", "3a")]
+
+
+_SIGNATURE = None
+_SIGNATURE_TS = 0.0
+_SIGNATURE_TTL = 60  # seconds
+
+
+def _bids_signature():
+    """bids_signature() of the BIDS root, recomputed at most once per _SIGNATURE_TTL."""
+    global _SIGNATURE, _SIGNATURE_TS
+    now = time.monotonic()
+    if _SIGNATURE is None or now - _SIGNATURE_TS > _SIGNATURE_TTL:
+        _SIGNATURE = bids_signature(_BIDS_ROOT_STR)
+        _SIGNATURE_TS = now
+    return _SIGNATURE
+
+
+def make_timepoint_content(label, key, session_summary):
+    """Recruitment donuts for one timepoint, from a precomputed summarize_sessions() result."""
+    ses_data = session_summary.get(key, {})
+    total_obs = ses_data.get("total", 0)
+    total_tgt = 263 * len(_SITES)
+    overall_pie = make_pie(f"{label} Overall", total_obs, total_tgt, emphasize=True)
+    site_pies = [make_pie(site, ses_data.get("sites", {}).get(site, 0), 263) for site in _SITES]
+    return html.Div(style=_DONUT_ROW_STYLE, children=[overall_pie] + site_pies)
+
+
+def _modality_percents(site_percents):
+    """make_modality_summary() input for one site's scan_bids() percentages."""
+    return {"modalities": [{"name": mod, "percent": site_percents.get(mod, 0)} for mod in MODALITIES]}
+
+
+def make_modality_content(percents):
+    """Per-site modality cards for one session, from the scan_bids() modality percentages."""
+    site_cards = [make_modality_summary(_modality_percents(percents.get(site_label, {})), site_label)
+                  for site_label in _SITES]
+    return html.Div(style=_CARD_ROW_STYLE, children=site_cards)
+
+
+@lru_cache(maxsize=16)
+def _timepoint_body(label, key, signature):
+    """Built timepoint tab body, reused until the BIDS tree changes."""
+    session_summary, _ = _summary(signature)
+    return make_timepoint_content(label, key, session_summary)
+
+
+@lru_cache(maxsize=16)
+def _modality_body(suffix, signature):
+    """Built modality tab body, reused until the BIDS tree changes."""
+    _, modality_percents = _summary(signature)
+    return make_modality_content(modality_percents[suffix])
+
+
+def invalidate():
+    """Drop the memoized summary and tab bodies so the next request rescans (e.g. from a file watcher)."""
+    global _LAST_UPDATED, _SIGNATURE
+    _cached_summary.cache_clear()
+    _timepoint_body.cache_clear()
+    _modality_body.cache_clear()
+    _LAST_UPDATED = ""
+    _SIGNATURE = None
+
+
+def make_lazy_tab(label, tab_id):
+    """Tab shell whose body is filled in by a callback the first time it is shown."""
+    return dbc.Tab(label=label, tab_id=tab_id,
+                   children=dcc.Loading(html.Div(id=f"{tab_id}-body")))
+
+
 # ---------------------------------------------------------------------
 # Floating Info Panel (Collapsible with Toggle Tab)
 # ---------------------------------------------------------------------
+@lru_cache(maxsize=4)
 def make_info_panel(dataset_root, last_updated):
-    """Collapsible right-side info panel with usage notes."""
+    """Collapsible right-side info panel with usage notes.
+
+    Cached like the static sections: only the last-updated stamp varies, so a request reuses the built panel.
+    """
     return html.Div(
         [
             # --- Toggle button (small side tab)
@@ -221,100 +325,82 @@ def make_info_panel(dataset_root, last_updated):
 # ---------------------------------------------------------------------
 # Layout
 # ---------------------------------------------------------------------
-def layout():
-    participants_tsv = bids_root / "participants.tsv"
-    session_summary = summarize_sessions(bids_root, participants_tsv)
-    last_updated = datetime.fromtimestamp(dataset_root.stat().st_mtime).strftime("%Y-%m-%d %H:%M")
-
-    # Timepoint tabs (recruitment)
-    def make_timepoint_tab(label, key):
-        ses_data = session_summary.get(key, {})
-        total_obs = ses_data.get("total", 0)
-        total_tgt = 263 * len(SITE_MAP)
-        overall_pie = make_pie(f"{label} Overall", total_obs, total_tgt, emphasize=True)
-        site_pies = [make_pie(site, ses_data.get("sites", {}).get(site, 0), 263) for site in SITE_MAP.values()]
-        return dbc.Tab(label=label, tab_id=key,
-                       children=html.Div(style={"display": "flex", "justifyContent": "center",
-                                                "gap": "45px", "flexWrap": "wrap", "marginTop": "25px"},
-                                         children=[overall_pie] + site_pies))
-
-    # Modality tabs (restored!)
-    def make_modality_tab(label, session_suffix):
-        participants_tsv = bids_root / "participants.tsv"
-        site_map = {}
-        if participants_tsv.exists():
-            try:
-                df = pd.read_csv(participants_tsv, sep="\t")
-                if "participant_id" in df.columns and "site_name" in df.columns:
-                    site_map = dict(zip(df["participant_id"], df["site_name"]))
-            except Exception as e:
-                print(f"[WARN] Failed to read participants.tsv: {e}")
-
-        site_cards = []
-        for site_label in SITE_MAP.values():
-            modalities = []
-            site_subjects = [s for s, site in site_map.items() if site.lower() == site_label.lower()]
-            total = len(site_subjects)
-            for mod in ["T1W", "T2W", "task-partlycloudy", "task-laluna", "DWI"]:
-                count = sum(1 for sub in site_subjects
-                            if (bids_root / sub / f"ses-{session_suffix}").exists()
-                            and any(mod.lower() in f.name.lower() for f in (bids_root / sub / f"ses-{session_suffix}").rglob("*.nii*")))
-                percent = round(100 * count / total, 1) if total else 0
-                modalities.append({"name": mod, "percent": percent})
-            site_cards.append(make_modality_summary({"modalities": modalities}, site_label))
-
-        return dbc.Tab(label=label, tab_id=f"mod-{session_suffix}",
-                       children=html.Div(style={"display": "flex", "justifyContent": "center",
-                                                "gap": "35px", "flexWrap": "wrap", "marginTop": "25px"},
-                                         children=site_cards))
-
-    timepoint_tabs = dbc.Tabs(
-        [make_timepoint_tab("Baseline", "baseline"),
-         make_timepoint_tab("Follow-up 1", "followup1"),
-         make_timepoint_tab("Follow-up 2", "followup2")],
-        id="timepoint-tabs", active_tab="baseline", style={"marginTop": "10px"},
-    )
+# Everything but the info panel is static per dataset, so it is built once at import
+# and the same component objects are reused by every layout() call.
+_HEADER = [
+    html.H1("Welcome to BIDS-Flux Dashboards", style={"marginBottom": "5px"}),
+    html.P("C-PIP study overview", style={"marginBottom": "25px"}),
+]
+
+_RECRUITMENT_SECTION = html.Div(
+    style={"textAlign": "center", "marginTop": "30px"},
+    children=[html.H4("Study Recruitment by Timepoint", style={"marginBottom": "15px"}),
+              dbc.Tabs([make_lazy_tab(label, key) for label, key in TIMEPOINT_TABS],
+                       id="timepoint-tabs", active_tab="baseline", style={"marginTop": "10px"}),
+              dcc.Store(id="timepoint-tabs-loaded", data=[])])
+
+_REDCAP_BUTTON_BLOCK = html.Div(
+    style={"textAlign": "center", "marginTop": "25px"},
+    children=[
+        dbc.Button("📊 Detailed Recruitment Info", href="/redcap", color="primary",
+                   style={"fontWeight": "600", "fontSize": "16px",
+                          "padding": "10px 24px", "borderRadius": "10px",
+                          "backgroundColor": "#2563eb", "border": "none"}),
+        html.Div("View full demographic breakdowns, equity metrics, and data quality trends from REDCap.",
+                 style={"marginTop": "10px", "color": "#6b7280", "fontSize": "16px"})])
+
+_MODALITY_SECTION = html.Div(
+    style={"marginTop": "50px", "textAlign": "center"},
+    children=[html.H3("Imaging Modality Coverage by Site", style={"marginBottom": "5px"}),
+              html.P("Each card shows the percentage of subjects at each site with available imaging modalities per timepoint.",
+                     style={"color": "#6b7280", "fontSize": "16px",
+                            "marginBottom": "25px", "maxWidth": "800px", "margin": "0 auto"}),
+              dbc.Tabs([make_lazy_tab(label, f"mod-{suffix}") for label, suffix in MODALITY_TABS],
+                       id="modality-tabs", active_tab="mod-1a", style={"marginTop": "10px"}),
+              dcc.Store(id="modality-tabs-loaded", data=[])])
+
+
+def _footer(dataset_name):
+    return html.Div(style={"marginTop": "80px", "textAlign": "center",
+                           "color": "#777", "fontSize": "13px", "paddingBottom": "40px"},
+                    children=f"Source: BIDS + REDCap | Dataset: {dataset_name}")
+
+
+_FOOTER = _footer(dataset_root.name)
+
+
+_LAST_UPDATED = ""
+_LAST_UPDATED_TS = 0.0
+_LAST_UPDATED_TTL = 60  # seconds
+
+
+def _get_last_updated():
+    """Dataset root mtime as display text, re-read at most once per _LAST_UPDATED_TTL."""
+    global _LAST_UPDATED, _LAST_UPDATED_TS
+    now = time.monotonic()
+    if not _LAST_UPDATED or now - _LAST_UPDATED_TS > _LAST_UPDATED_TTL:
+        try:
+            _LAST_UPDATED = datetime.fromtimestamp(os.stat(_DATASET_ROOT_STR).st_mtime).strftime("%Y-%m-%d %H:%M")
+        except OSError:
+            _LAST_UPDATED = "unknown"
+        _LAST_UPDATED_TS = now
+    return _LAST_UPDATED
 
-    modality_tabs = dbc.Tabs(
-        [make_modality_tab("Baseline", "1a"),
-         make_modality_tab("Follow-up 1", "2a"),
-         make_modality_tab("Follow-up 2", "3a")],
-        id="modality-tabs", active_tab="mod-1a", style={"marginTop": "10px"},
-    )
+
+def layout():
+    last_updated = _get_last_updated()
 
     return html.Div(
+        id="home-page",  # scopes assets/home.css
         className="page-transition",
         style={"fontFamily": "Inter, sans-serif", "margin": "20px auto", "maxWidth": "1400px"},
         children=[
-            GLOBAL_STYLE,
-            html.H1("Welcome to BIDS-Flux Dashboards", style={"marginBottom": "5px"}),
-            html.P("C-PIP study overview", style={"marginBottom": "25px"}),
-
-            html.Div(style={"textAlign": "center", "marginTop": "30px"},
-                     children=[html.H4("Study Recruitment by Timepoint", style={"marginBottom": "15px"}),
-                               timepoint_tabs]),
-
-            html.Div(style={"textAlign": "center", "marginTop": "25px"},
-                     children=[
-                         dbc.Button("📊 Detailed Recruitment Info", href="/redcap", color="primary",
-                                    style={"fontWeight": "600", "fontSize": "16px",
-                                           "padding": "10px 24px", "borderRadius": "10px",
-                                           "backgroundColor": "#2563eb", "border": "none"}),
-                         html.Div("View full demographic breakdowns, equity metrics, and data quality trends from REDCap.",
-                                  style={"marginTop": "10px", "color": "#6b7280", "fontSize": "16px"})]),
-
-            html.Div(style={"marginTop": "50px", "textAlign": "center"},
-                     children=[html.H3("Imaging Modality Coverage by Site", style={"marginBottom": "5px"}),
-                               html.P("Each card shows the percentage of subjects at each site with available imaging modalities per timepoint.",
-                                      style={"color": "#6b7280", "fontSize": "16px",
-                                             "marginBottom": "25px", "maxWidth": "800px", "margin": "0 auto"}),
-                               modality_tabs]),
-
+            *_HEADER,
+            _RECRUITMENT_SECTION,
+            _REDCAP_BUTTON_BLOCK,
+            _MODALITY_SECTION,
             make_info_panel(dataset_root, last_updated),
-
-            html.Div(style={"marginTop": "80px", "textAlign": "center",
-                            "color": "#777", "fontSize": "13px", "paddingBottom": "40px"},
-                     children=f"Source: BIDS + REDCap | Dataset: {dataset_root.name}"),
+            _FOOTER,
         ],
     )
 
@@ -336,426 +422,32 @@ def register_callbacks(app):
         else:
             return "floating-info-panel collapsed"  # collapse
 
+    # Tab bodies are built only when their tab is first shown; a body already in the
+    # browser (tracked in a small store) is never re-sent when switching back to its tab.
+    @app.callback(
+        [Output(f"{key}-body", "children") for _, key in TIMEPOINT_TABS]
+        + [Output("timepoint-tabs-loaded", "data")],
+        Input("timepoint-tabs", "active_tab"),
+        State("timepoint-tabs-loaded", "data"),
+    )
+    def render_timepoint_tab(active_tab, loaded):
+        loaded = loaded or []
+        if active_tab in loaded or active_tab not in {key for _, key in TIMEPOINT_TABS}:
+            raise dash.exceptions.PreventUpdate
+        signature = _bids_signature()
+        return [_timepoint_body(label, key, signature) if key == active_tab else dash.no_update
+                for label, key in TIMEPOINT_TABS] + [loaded + [active_tab]]
 
-
-
-
-
-# import dash
-# from dash import html, dcc
-# from pathlib import Path
-# import os
-# import pandas as pd
-# import plotly.graph_objs as go
-# from datetime import datetime
-# import dash_bootstrap_components as dbc
-
-# from flux_notebooks.redcap.summarize_targets import summarize_modalities
-# from flux_notebooks.bids.summarize_bids import summarize_bids
-# from flux_notebooks.freesurfer.summarize_freesurfer import summarize_freesurfer
-# from flux_notebooks.theme import SITE_COLORS
-
-# dash.register_page(__name__, path="/", name="Home")
-
-# # ---------------------------------------------------------------------
-# # Site mapping and dataset paths
-# # ---------------------------------------------------------------------
-# SITE_MAP = {"montreal": "Montreal", "calgary": "Calgary", "toronto": "Toronto"}
-
-# dataset_root = Path(os.environ.get("FLUX_DATASET_ROOT", "superdemo_real")).resolve()
-# bids_root = (
-#     dataset_root
-#     if (dataset_root / "dataset_description.json").exists()
-#     else (dataset_root / "bids")
-# ).resolve()
-# fs_root = dataset_root / "derivatives" / "freesurfer"
-
-# # ---------------------------------------------------------------------
-# # Inline CSS
-# # ---------------------------------------------------------------------
-# GLOBAL_STYLE = dcc.Markdown(
-#     """
-#     <style>
-#     body {
-#       font-family: 'Inter', sans-serif;
-#       background-color: #f8f9fa;
-#     }
-#     .page-transition { animation: fadeSlideIn 0.6s ease-out forwards; }
-#     @keyframes fadeSlideIn { from {opacity:0; transform:translateY(15px);} to {opacity:1; transform:translateY(0);} }
-#     .card-fade { opacity:0; transform:translateY(10px); animation: fadeInUp 0.7s ease forwards; }
-#     @keyframes fadeInUp { from {opacity:0; transform:translateY(15px);} to {opacity:1; transform:translateY(0);} }
-#     .glass-card {
-#       background: linear-gradient(145deg, #ffffff, #f3f3f3);
-#       border: 1px solid rgba(255,255,255,0.25);
-#       backdrop-filter: blur(8px);
-#       border-radius: 12px;
-#       box-shadow: 0 3px 6px rgba(0,0,0,0.08);
-#       transition: transform 0.2s ease, box-shadow 0.2s ease;
-#     }
-#     .glass-card:hover { transform: translateY(-4px); box-shadow: 0 8px 18px rgba(0,0,0,0.15); }
-#     .site-line { height: 4px; width: 40%; margin: 0 auto 15px; border-radius: 2px; }
-#     </style>
-#     """,
-#     dangerously_allow_html=True,
-# )
-
-# # ---------------------------------------------------------------------
-# # Helpers
-# # ---------------------------------------------------------------------
-# def safe_count(func, *args, **kwargs):
-#     try:
-#         return func(*args, **kwargs)
-#     except Exception:
-#         return {}
-
-# # ---------------------------------------------------------------------
-# # Recruitment summarizer
-# # ---------------------------------------------------------------------
-# def summarize_sessions(bids_root: Path, participants_file: Path):
-#     """Count subjects by session and site."""
-#     summary = {
-#         "baseline": {"sites": {}, "total": 0},
-#         "followup1": {"sites": {}, "total": 0},
-#         "followup2": {"sites": {}, "total": 0},
-#     }
-#     if not bids_root.exists():
-#         return summary
-
-#     try:
-#         df = pd.read_csv(participants_file, sep="\t")
-#         site_lookup = dict(zip(df["participant_id"], df["site_name"]))
-#     except Exception as e:
-#         print(f"[WARN] Failed to load participants.tsv: {e}")
-#         site_lookup = {}
-
-#     for subdir in bids_root.glob("sub-*"):
-#         if not subdir.is_dir():
-#             continue
-#         sub = subdir.name
-#         site = site_lookup.get(sub, "Unknown")
-#         sessions = [p.name for p in subdir.glob("ses-*") if p.is_dir()]
-#         for ses in sessions:
-#             key = None
-#             if ses == "ses-1a": key = "baseline"
-#             elif ses == "ses-2a": key = "followup1"
-#             elif ses == "ses-3a": key = "followup2"
-#             if key:
-#                 summary[key]["total"] += 1
-#                 summary[key]["sites"][site] = summary[key]["sites"].get(site, 0) + 1
-#     return summary
-
-
-# def make_timepoint_tab(label, key):
-#     """Generate donut tabs for recruitment progress by timepoint."""
-#     # Safely retrieve counts from summarize_sessions()
-#     participants_tsv = bids_root / "participants.tsv"
-#     session_summary = summarize_sessions(bids_root, participants_tsv)
-#     ses_data = session_summary.get(key, {})
-#     total_obs = ses_data.get("total", 0)
-#     total_tgt = 263 * len(SITE_MAP)  # assume 263 target per site
-
-#     overall_pie = make_pie(f"{label} Overall", total_obs, total_tgt, emphasize=True)
-#     site_pies = []
-#     for site_label in SITE_MAP.values():
-#         observed = ses_data.get("sites", {}).get(site_label, 0)
-#         site_pies.append(make_pie(site_label, observed, 263))
-
-#     return dbc.Tab(
-#         label=label,
-#         tab_id=key,
-#         children=html.Div(
-#             style={
-#                 "display": "flex",
-#                 "justifyContent": "center",
-#                 "alignItems": "flex-start",
-#                 "gap": "45px",
-#                 "flexWrap": "wrap",
-#                 "marginTop": "25px",
-#             },
-#             children=[overall_pie] + site_pies,
-#         ),
-#     )
-
-
-
-# # ---------------------------------------------------------------------
-# # Visualization components
-# # ---------------------------------------------------------------------
-# def make_pie(label, enrolled, target, emphasize=False):
-#     """Single-layer donut plot."""
-#     enrolled_pct = round((enrolled / target * 100), 1) if target else 0
-#     site_color = SITE_COLORS.get(label, "#FFB300")
-#     fig = go.Figure()
-#     fig.add_trace(
-#         go.Pie(
-#             values=[enrolled, max(target - enrolled, 0)],
-#             labels=["Enrolled", "Remaining"],
-#             marker_colors=[site_color, "#E0E0E0"],
-#             hole=0.55, sort=False, textinfo="none", showlegend=False,
-#         )
-#     )
-
-#     size_factor = 2.2 if emphasize else 1.0
-#     base_size = 160
-#     fig.update_traces(marker_line=dict(color="white", width=2))
-#     fig.update_layout(
-#         height=int(base_size * size_factor),
-#         width=int(base_size * size_factor),
-#         margin=dict(t=10, b=10, l=10, r=10),
-#         paper_bgcolor="rgba(0,0,0,0)",
-#         plot_bgcolor="rgba(0,0,0,0)",
-#         annotations=[
-#             dict(
-#                 text=f"<b>{enrolled_pct:.1f}%</b><br><span style='font-size:11px;color:#666;'>enrolled</span>",
-#                 x=0.5, y=0.5, showarrow=False, align="center",
-#                 font=dict(size=int(18 * size_factor), color="#111", family="Inter, sans-serif"),
-#             )
-#         ],
-#     )
-#     gradient_color = f"radial-gradient(circle at 30% 30%, {site_color}, {site_color}15, #f8f8f8)"
-#     return html.Div(
-#         className=f"card-fade glass-card",
-#         style={
-#             "textAlign": "center",
-#             "margin": "10px",
-#             "padding": "12px",
-#             "borderRadius": "12px",
-#             "background": gradient_color,
-#             "boxShadow": "0 5px 14px rgba(0,0,0,0.15)" if emphasize else "0 3px 8px rgba(0,0,0,0.1)",
-#         },
-#         children=[
-#             html.H5(label, style={"marginBottom": "4px", "color": site_color, "fontWeight": "600"}),
-#             dcc.Graph(figure=fig, config={"displayModeBar": False}),
-#             html.Div(f"{enrolled}/{target} enrolled", style={"fontSize": "12px", "color": "#555"}),
-#         ],
-#     )
-
-# def make_modality_summary(mod_data, site_name=None):
-#     """Compact modality summary per site."""
-#     site_color = SITE_COLORS.get(site_name, "#444")
-#     modality_labels = ["T1W", "T2W", "task-partlycloudy", "task-laluna", "DWI"]
-#     percents = {m["name"]: m.get("percent", 0) for m in mod_data.get("modalities", [])}
-
-#     rows = []
-#     for label in modality_labels:
-#         val = percents.get(label, 0)
-#         color = "#888" #color = site_color if val >= 80 else "#888"
-#         rows.append(
-#             html.Div(
-#                 [
-#                     html.Span(label, style={"fontWeight": "600"}),
-#                     html.Span(f"{val:.1f}%", style={"float": "right", "color": color}),
-#                 ],
-#                 style={"marginBottom": "6px", "fontSize": "15px", "color": "#333" if val > 0 else "#999"},
-#             )
-#         )
-
-#     return html.Div(
-#         className=f"glass-card card-fade",
-#         style={
-#             "padding": "35px 45px",
-#             "borderRadius": "16px",
-#             "minWidth": "360px",
-#             "maxWidth": "420px",
-#             "minHeight": "260px",
-#             "textAlign": "left",
-#             "boxShadow": "0 4px 16px rgba(0,0,0,0.12)",
-#             "background": "linear-gradient(135deg, #ffffff 0%, #f7f7f7 100%)",
-#         },
-#         children=[
-#             html.H4(site_name, style={"textAlign": "center", "marginBottom": "12px", "color": site_color, "fontWeight": "600"}),
-#             html.Div(className="site-line", style={"backgroundColor": site_color}),
-#             html.Div(rows),
-#         ],
-#     )
-
-# # ---------------------------------------------------------------------
-# # Layout
-# # ---------------------------------------------------------------------
-# def layout():
-#     participants_tsv = bids_root / "participants.tsv"
-#     session_summary = summarize_sessions(bids_root, participants_tsv)
-#     last_updated = datetime.fromtimestamp(dataset_root.stat().st_mtime).strftime("%Y-%m-%d %H:%M")
-
-#     def make_modality_tab(label, session_suffix):
-#         """Compute modality coverage per site and session, using participants.tsv for site lookup."""
-#         participants_tsv = bids_root / "participants.tsv"
-#         site_map = {}
-
-#         # --- Load site mapping from participants.tsv ---
-#         if participants_tsv.exists():
-#             try:
-#                 df = pd.read_csv(participants_tsv, sep="\t")
-#                 if "participant_id" in df.columns and "site_name" in df.columns:
-#                     site_map = dict(zip(df["participant_id"], df["site_name"]))
-#                 else:
-#                     print("[WARN] participants.tsv missing 'participant_id' or 'site_name'")
-#             except Exception as e:
-#                 print(f"[WARN] Failed to read participants.tsv: {e}")
-
-#         # --- Initialize site-wise summaries ---
-#         site_cards = []
-#         for site_label in SITE_MAP.values():
-#             modalities = []
-#             site_subjects = [s for s, site in site_map.items() if site.lower() == site_label.lower()]
-#             total = len(site_subjects)
-#             if total == 0:
-#                 site_cards.append(make_modality_summary({"modalities": []}, site_label))
-#                 continue
-
-#             # --- Count files per modality ---
-#             for mod in ["T1W", "T2W", "task-partlycloudy", "task-laluna", "DWI"]:
-#                 count = 0
-#                 for sub_id in site_subjects:
-#                     sub_dir = bids_root / sub_id
-#                     ses_dir = sub_dir / f"ses-{session_suffix}"
-#                     if not ses_dir.exists():
-#                         continue
-#                     for f in ses_dir.rglob("*.nii*"):
-#                         if mod.lower() in f.name.lower():
-#                             count += 1
-#                             break
-#                 percent = round(100 * count / total, 1)
-#                 modalities.append({"name": mod, "percent": percent})
-
-#             mod_summary = {"modalities": modalities}
-#             site_cards.append(make_modality_summary(mod_summary, site_label))
-
-#         # --- Return the tab component ---
-#         return dbc.Tab(
-#             label=label,
-#             tab_id=f"mod-{session_suffix}",
-#             children=html.Div(
-#                 style={
-#                     "display": "flex",
-#                     "justifyContent": "center",
-#                     "alignItems": "flex-start",
-#                     "gap": "35px",
-#                     "flexWrap": "wrap",
-#                     "marginTop": "25px",
-#                 },
-#                 children=site_cards,
-#             ),
-#         )
-
-
-#     modality_tabs = dbc.Tabs(
-#         [
-#             make_modality_tab("Baseline", "1a"),
-#             make_modality_tab("Follow-up 1", "2a"),
-#             make_modality_tab("Follow-up 2", "3a"),
-#         ],
-#         id="modality-tabs",
-#         active_tab="mod-1a",
-#         style={"marginTop": "10px"},
-#     )
-
-
-#     html.Div(
-#         style={"marginTop": "50px", "textAlign": "center"},
-#         children=[
-#             html.H3("Imaging Modality Coverage by Site", style={"marginBottom": "5px"}),
-#             html.P(
-#                 "Each card shows the percentage of subjects at each site with available imaging modalities per timepoint.",
-#                 style={
-#                     "color": "#6b7280",
-#                     "fontSize": "15px",
-#                     "marginBottom": "25px",
-#                     "maxWidth": "800px",
-#                     "margin": "0 auto",
-#                 },
-#             ),
-#             modality_tabs,
-#         ],
-#     ),
-
-
-
-#     timepoint_tabs = dbc.Tabs(
-#         [
-#             make_timepoint_tab("Baseline", "baseline"),
-#             make_timepoint_tab("Follow-up 1", "followup1"),
-#             make_timepoint_tab("Follow-up 2", "followup2"),
-#         ],
-#         id="timepoint-tabs",
-#         active_tab="baseline",
-#         style={"marginTop": "10px"},
-#     )
-
-#     # Modalities
-#     try:
-#         mod_summaries = summarize_modalities(bids_root, dataset_root / "derivatives")
-#     except Exception as e:
-#         print("[WARN] summarize_modalities failed:", e)
-#         mod_summaries = {}
-
-#     return html.Div(
-#         className="page-transition",
-#         style={"fontFamily": "Inter, sans-serif", "margin": "20px auto", "maxWidth": "1400px"},
-#         children=[
-#             GLOBAL_STYLE,
-#             # html.Img(
-#             #     src="/assets/CPIP-vert-full-colour.svg",
-#             #     style={"height": "80px", "flexShrink": "0"},
-#             # ),
-
-#             html.H1("Welcome to BIDS-Flux Dashboards", style={"marginBottom": "5px"}),
-#             html.P("C-PIP study overview", style={"marginBottom": "25px"}),
-
-#             # Recruitment donuts
-#             html.Div(
-#                 style={"textAlign": "center", "marginTop": "30px"},
-#                 children=[
-#                     html.H4("Study Recruitment by Timepoint", style={"marginBottom": "15px"}),
-#                     timepoint_tabs,
-#                 ],
-#             ),
-
-#             # REDCap link
-#             html.Div(
-#                 style={"textAlign": "center", "marginTop": "25px"},
-#                 children=[
-#                     dbc.Button("📊 Detailed Recruitment Info", href="/redcap", color="primary",
-#                                style={"fontWeight": "600", "fontSize": "16px", "padding": "10px 24px",
-#                                       "borderRadius": "10px", "backgroundColor": "#2563eb", "border": "none"}),
-#                     html.Div("View full demographic breakdowns, equity metrics, and data quality trends from REDCap.",
-#                              style={"marginTop": "10px", "color": "#6b7280", "fontSize": "14px"}),
-#                 ],
-#             ),
-#             html.Div(
-#                 style={"marginTop": "50px", "textAlign": "center"},
-#                 children=[
-#                     html.H3("Imaging Modality Coverage by Site", style={"marginBottom": "5px"}),
-#                     html.P(
-#                         "Each card shows the percentage of subjects at each site with available imaging modalities per timepoint.",
-#                         style={
-#                             "color": "#6b7280",
-#                             "fontSize": "15px",
-#                             "marginBottom": "25px",
-#                             "maxWidth": "800px",
-#                             "margin": "0 auto",
-#                         },
-#                     ),
-#                     modality_tabs,
-#                 ],
-#             ),
-#             # Go to data button
-#             html.Div(
-#                 style={"textAlign": "center", "marginTop": "25px"},
-#                 children=[
-#                     dbc.Button("🧠 Go to Data", href="/bids", color="success",
-#                                style={"fontWeight": "600", "fontSize": "16px", "padding": "10px 24px",
-#                                       "borderRadius": "10px", "backgroundColor": "#16a34a", "border": "none"}),
-#                     html.Div("Explore the processed BIDS datasets, derivatives, and quality reports.",
-#                              style={"marginTop": "10px", "color": "#6b7280", "fontSize": "14px"}),
-#                 ],
-#             ),
-
-#             # Footer
-#             html.Div(
-#                 style={"marginTop": "50px", "textAlign": "center", "color": "#777", "fontSize": "13px"},
-#                 children=f"Last updated: {last_updated} | Source: BIDS + REDCap | Dataset: {dataset_root.name}",
-#             ),
-#         ],
-#     )
-
+    @app.callback(
+        [Output(f"mod-{suffix}-body", "children") for _, suffix in MODALITY_TABS]
+        + [Output("modality-tabs-loaded", "data")],
+        Input("modality-tabs", "active_tab"),
+        State("modality-tabs-loaded", "data"),
+    )
+    def render_modality_tab(active_tab, loaded):
+        loaded = loaded or []
+        if active_tab in loaded or active_tab not in {f"mod-{suffix}" for _, suffix in MODALITY_TABS}:
+            raise dash.exceptions.PreventUpdate
+        signature = _bids_signature()
+        return [_modality_body(suffix, signature) if f"mod-{suffix}" == active_tab else dash.no_update
+                for _, suffix in MODALITY_TABS] + [loaded + [active_tab]]
@@ -1,10 +1,12 @@
+import os
 import dash
 from dash import html, dcc, Input, Output, callback
 import dash_bootstrap_components as dbc
-import pandas as pd
 from pathlib import Path
 from collections import defaultdict
+from functools import lru_cache
 from flux_notebooks.config import Settings
+from flux_notebooks.cache.participants import load_participants, load_site_subjects
 
 dash.register_page(__name__, path="/mriqc", name="MRIQC Reports")
 
@@ -19,15 +21,33 @@ PARTICIPANTS_TSV = BIDS_ROOT / "participants.tsv"
 # ---------------------------------------------------------------------
 # Utilities
 # ---------------------------------------------------------------------
+def _walk_html_parts(root):
+    """Relative path parts of every .html file under root, in sorted-Path order.
+
+    os.walk plus a suffix test instead of rglob's per-entry fnmatch. Like rglob, it does
+    not descend into symlinked directories (so a link cycle cannot recurse forever).
+    """
+    found = []
+    for dirpath, _dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root)
+        prefix = () if rel_dir == "." else tuple(rel_dir.split(os.sep))
+        found.extend(prefix + (name,) for name in filenames if name.endswith(".html"))
+    found.sort()
+    return found
+
+
 def list_htmls():
-    htmls = sorted(DATA_ROOT.rglob("*.html"))
     records = []
-    for f in htmls:
-        parts = f.relative_to(DATA_ROOT).parts
+    for parts in _walk_html_parts(DATA_ROOT):
         if len(parts) >= 3:
+            rel = "/".join(parts)
+            f = DATA_ROOT / rel
             sub, ses = parts[0], parts[1]
             modality = f.name.split("_")[-1].replace(".html", "")
-            records.append(dict(sub=sub, ses=ses, modality=modality, path=f))
+            # Link text, href and search key are fixed per report; build the strings once here.
+            records.append(dict(sub=sub, ses=ses, modality=modality, path=f,
+                                label=f.name.replace(".html", ""), href=f"/mriqc_files/{rel}",
+                                name_lc=f.name.lower()))
     return records
 
 
@@ -41,20 +61,21 @@ def color_for_modality(name: str):
     return "#ccc"
 
 
+_LINK_STYLE_BASE = {"display": "block", "margin": "2px 0", "textDecoration": "none", "fontWeight": "500"}
+
+
+@lru_cache(maxsize=None)
+def _link_style(color):
+    """One shared style dict per modality color (a handful in total)."""
+    return {**_LINK_STYLE_BASE, "color": color}
+
+
 def make_link(r):
-    rel = r["path"].relative_to(DATA_ROOT)
-    color = color_for_modality(r["modality"])
     return html.A(
-        r["path"].name.replace(".html", ""),
-        href=f"/mriqc_files/{rel}",
+        r["label"],
+        href=r["href"],
         target="_blank",
-        style={
-            "display": "block",
-            "margin": "2px 0",
-            "color": color,
-            "textDecoration": "none",
-            "fontWeight": "500",
-        },
+        style=_link_style(color_for_modality(r["modality"])),
     )
 
 
@@ -190,24 +211,14 @@ def update_subject_options(selected_site):
     Dynamically update the subject dropdown based on the selected site.
     Uses participants.tsv to identify subjects associated with each site.
     """
-    if not PARTICIPANTS_TSV.exists():
-        print(f"[WARN] participants.tsv not found at {PARTICIPANTS_TSV}")
-        return [{"label": s, "value": s} for s in SUBJECTS]
-
-    try:
-        df = pd.read_csv(PARTICIPANTS_TSV, sep="\t")
-    except Exception as e:
-        print(f"[WARN] Failed to read participants.tsv: {e}")
-        return [{"label": s, "value": s} for s in SUBJECTS]
-
-    if "site_name" not in df.columns or "participant_id" not in df.columns:
-        print("[WARN] participants.tsv missing required columns: 'site_name' or 'participant_id'")
+    df = load_participants(PARTICIPANTS_TSV)
+    if df is None:
         return [{"label": s, "value": s} for s in SUBJECTS]
 
     if selected_site:
-        df = df[df["site_name"].str.lower() == selected_site.lower()]
-
-    subs = sorted(df["participant_id"].unique().tolist())
+        subs = load_site_subjects(PARTICIPANTS_TSV).get(selected_site.lower(), [])
+    else:
+        subs = sorted(df["participant_id"].unique().tolist())
     return [{"label": s, "value": s} for s in subs]
 
 
@@ -225,16 +236,9 @@ def update_view(site_filter, sub_filter, mod_filter, search_text):
     reports = REPORTS
 
     # --- Site filter (using participants.tsv)
-    if site_filter and PARTICIPANTS_TSV.exists():
-        try:
-            df = pd.read_csv(PARTICIPANTS_TSV, sep="\t")
-            if "site_name" in df.columns and "participant_id" in df.columns:
-                subs_for_site = df.loc[
-                    df["site_name"].str.lower() == site_filter.lower(), "participant_id"
-                ].tolist()
-                reports = [r for r in reports if r["sub"] in subs_for_site]
-        except Exception as e:
-            print(f"[WARN] Site filter failed: {e}")
+    if site_filter and load_participants(PARTICIPANTS_TSV) is not None:
+        subs_for_site = set(load_site_subjects(PARTICIPANTS_TSV).get(site_filter.lower(), ()))
+        reports = [r for r in reports if r["sub"] in subs_for_site]
 
     # --- Subject filter
     if sub_filter:
@@ -247,7 +251,7 @@ def update_view(site_filter, sub_filter, mod_filter, search_text):
     # --- Search filter
     if search_text:
         text = search_text.lower()
-        reports = [r for r in reports if text in r["path"].name.lower()]
+        reports = [r for r in reports if text in r["name_lc"]]
 
     if not reports:
         return html.P(
@@ -1,6 +1,8 @@
 import os
-import glob
 import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import pandas as pd
 import dash
 from dash import html, dcc, Input, Output, State, callback
@@ -54,24 +56,64 @@ def make_inventory_card(sub_id):
 # --- Quality Control (with human ratings + notes)
 # ------------------------------------------------------------
 
+@lru_cache(maxsize=2)
+def _read_human_qc(path: str, mtime_ns: int):
+    df = pd.read_csv(path, dtype=str)
+    df.columns = df.columns.str.strip().str.lower()
+    if "subjid" in df.columns:
+        df["subjid"] = (
+            df["subjid"]
+            .astype(str)
+            .str.replace("sub-", "", regex=False)
+            .str.strip()
+            .str.lower()
+        )
+    return df
+
+
+def load_human_qc(path: str):
+    """Normalized human QC table, or None if the CSV is absent.
+
+    Re-read only when the file's mtime changes; callers must not modify the returned frame.
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return _read_human_qc(path, mtime_ns)
+
+
+# MRIQC outputs shown in the QC strip; one compiled scan per filename.
+_QC_MODALITY_RE = re.compile(r"T1w|bold|dwi")
+
+
+def _iter_json_files(root):
+    """Yield (path, name) for every non-hidden .json file under root.
+
+    A plain os.walk with a suffix test; matches the old recursive glob without fnmatch.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for fname in filenames:
+            if fname.endswith(".json") and not fname.startswith("."):
+                yield os.path.join(dirpath, fname), fname
+
+
+def _read_json(path):
+    """Parsed JSON file, or None when it cannot be read."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
 def make_qc_strip(subject_id, session_filter=None):
     qc_root = os.path.join(S.dataset_root, "qc", "mriqc", subject_id)
     human_qc_path = os.path.join(S.dataset_root, "qc", "human_qc.csv")
 
-    # --- Load and normalize human QC CSV ---
-    human_qc = None
-    if os.path.exists(human_qc_path):
-        df = pd.read_csv(human_qc_path, dtype=str)
-        df.columns = df.columns.str.strip().str.lower()
-        if "subjid" in df.columns:
-            df["subjid"] = (
-                df["subjid"]
-                .astype(str)
-                .str.replace("sub-", "", regex=False)
-                .str.strip()
-                .str.lower()
-            )
-        human_qc = df
+    # --- Load and normalize human QC CSV (cached on its mtime) ---
+    human_qc = load_human_qc(human_qc_path)
 
     if not os.path.exists(qc_root):
         return html.Div("No MRIQC data found.", className="text-muted fst-italic")
@@ -156,14 +198,12 @@ def make_qc_strip(subject_id, session_filter=None):
 
     # --- Parse MRIQC JSONs ---
     sessions = {}
-    for json_file in glob.glob(os.path.join(qc_root, "**", "*.json"), recursive=True):
-        fname = os.path.basename(json_file)
-        if not any(k in fname for k in ["T1w", "bold", "dwi"]):
-            continue
-        try:
-            with open(json_file, "r") as f:
-                data = json.load(f)
-        except Exception:
+    candidates = [(path, fname) for path, fname in _iter_json_files(qc_root) if _QC_MODALITY_RE.search(fname)]
+    # File reads release the GIL; map() keeps the walk order for the table rows.
+    with ThreadPoolExecutor(max_workers=min(8, len(candidates) or 1)) as pool:
+        loaded = list(pool.map(lambda c: _read_json(c[0]), candidates))
+    for (json_file, fname), data in zip(candidates, loaded):
+        if data is None:
             continue
 
         ses = next((p for p in fname.split("_") if p.startswith("ses-")), "unknown")
@@ -269,6 +309,15 @@ def make_qc_strip(subject_id, session_filter=None):
 # --- Derived Data Status
 # ------------------------------------------------------------
 
+def _entry_names(dir_path):
+    """Names in dir_path as a set (empty when it does not exist)."""
+    try:
+        with os.scandir(dir_path) as it:
+            return {e.name for e in it}
+    except OSError:
+        return set()
+
+
 def make_pipeline_status(subject_id):
     root = S.dataset_root
     subject_root = os.path.join(BIDS_ROOT, subject_id)
@@ -276,17 +325,18 @@ def make_pipeline_status(subject_id):
         return html.Div()
 
     sessions = [s for s in os.listdir(subject_root) if s.startswith("ses-")] or ["—"]
+    # One directory listing per pipeline instead of a stat per (session, pipeline).
+    bids_done = _entry_names(os.path.join(root, "bids", subject_id))
+    mriqc_done = os.path.exists(os.path.join(root, "qc", "mriqc", subject_id))
+    fmriprep_done = _entry_names(os.path.join(root, "derivatives", "fmriprep", subject_id))
+    connectome_done = _entry_names(os.path.join(root, "derivatives", "connectome", subject_id))
     rows = []
     for ses in sorted(sessions):
         paths = {
-            "DICOM → BIDS": os.path.exists(os.path.join(root, "bids", subject_id, ses)),
-            "MRIQC": os.path.exists(os.path.join(root, "qc", "mriqc", subject_id)),
-            "fMRIPrep": os.path.exists(
-                os.path.join(root, "derivatives", "fmriprep", subject_id, ses)
-            ),
-            "Connectome": os.path.exists(
-                os.path.join(root, "derivatives", "connectome", subject_id, ses)
-            ),
+            "DICOM → BIDS": ses in bids_done,
+            "MRIQC": mriqc_done,
+            "fMRIPrep": ses in fmriprep_done,
+            "Connectome": ses in connectome_done,
         }
         row_cells = [html.Th(ses)] + [
             html.Td("✅" if done else "⏳") for done in paths.values()
@@ -0,0 +1,297 @@
+# src/flux_notebooks/cache/build_summary.py
+"""Precomputed home-page summary for a dataset.
+
+The BIDS tree only changes when data is added, so the recruitment and modality counts
+shown on the dashboard home page can be computed once (at ingest, or from cron) and
+written to a per-dataset file under ``$FLUX_CACHE_DIR`` (default ``~/.cache/flux-notebooks``).
+The page reads that file and only falls back to a live scan when it is missing or its
+``bids_signature`` no longer matches. Point cron and the dashboard at the same FLUX_CACHE_DIR
+when they run as different users.
+"""
+from __future__ import annotations
+import argparse, hashlib, json, os, re, csv, tempfile
+from array import array
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from numba import njit
+    _HAVE_NUMBA = True
+except Exception:
+    njit = None
+    _HAVE_NUMBA = False
+
+SITE_MAP = {"montreal": "Montreal", "calgary": "Calgary", "toronto": "Toronto"}
+MODALITIES = ["T1W", "T2W", "task-partlycloudy", "task-laluna", "DWI"]
+SESSION_SUFFIXES = ("1a", "2a", "3a")
+SESSION_KEYS = {"ses-1a": "baseline", "ses-2a": "followup1", "ses-3a": "followup2"}
+
+SUMMARY_VERSION = 3
+
+
+def resolve_bids_root(dataset_root: Path) -> Path:
+    """The dataset itself if it is a BIDS root, else its ``bids/`` subfolder."""
+    if (dataset_root / "dataset_description.json").exists():
+        return dataset_root
+    return dataset_root / "bids"
+
+
+@lru_cache(maxsize=4)
+def _read_site_lookup(path_str: str, mtime_ns: int):
+    # utf-8-sig: a BOM would otherwise end up in the first header name, as pandas never allowed
+    with open(path_str, newline="", encoding="utf-8-sig") as f:
+        return {row["participant_id"]: row["site_name"] for row in csv.DictReader(f, delimiter="\t")}
+
+
+def load_site_lookup(participants_file: Path):
+    """participant_id -> site_name from participants.tsv ({} if unreadable).
+
+    Only two columns are needed, so this reads the TSV with the csv module and caches
+    the result on the file's mtime.
+    """
+    try:
+        return _read_site_lookup(str(participants_file), participants_file.stat().st_mtime_ns)
+    except Exception as e:
+        print(f"[WARN] Failed to load participants.tsv: {e}")
+        return {}
+
+
+_MOD_INDEX = {m.lower(): i for i, m in enumerate(MODALITIES)}
+_DATATYPE_DIRS = frozenset({"anat", "func", "dwi"})
+_MOD_PATTERN = re.compile("|".join(re.escape(m) for m in MODALITIES), re.IGNORECASE)
+
+
+def _session_modalities(ses_dir: str):
+    """Flags (aligned with MODALITIES) for the modalities found among NIfTI files under ses_dir.
+
+    Walks the session once with os.scandir, descending only into the BIDS datatype folders
+    that can hold these modalities, and stops as soon as every modality is found;
+    a missing session directory simply yields all False.
+    """
+    found = [False] * len(MODALITIES)
+    remaining = len(MODALITIES)
+    stack = [ses_dir]
+    while stack and remaining:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in _DATATYPE_DIRS:
+                        stack.append(entry.path)
+                    continue
+                if ".nii" not in entry.name:
+                    continue
+                for m in _MOD_PATTERN.finditer(entry.name):
+                    i = _MOD_INDEX[m.group().lower()]
+                    if not found[i]:
+                        found[i] = True
+                        remaining -= 1
+                if not remaining:
+                    break
+    return found
+
+
+def _scan_subject(sub_dir: str, with_modalities: bool):
+    """[(ses name, modality flags or None)] for the known sessions of one subject."""
+    try:
+        with os.scandir(sub_dir) as it:
+            ses_names = [e.name for e in it if e.name in SESSION_KEYS and e.is_dir(follow_symlinks=False)]
+    except OSError:
+        return []
+    return [(name, _session_modalities(os.path.join(sub_dir, name)) if with_modalities else None)
+            for name in ses_names]
+
+
+def _percent_table(counts, totals):
+    """Percent of each site's headcount with each modality, from (session, site, modality) counts."""
+    return np.round(100.0 * counts / np.maximum(totals, 1)[None, :, None], 1)
+
+
+if _HAVE_NUMBA:
+    @njit(cache=True)
+    def _percent_table(counts, totals):  # noqa: F811  (same math as above, as a native loop)
+        out = np.zeros(counts.shape, dtype=np.float64)
+        for s in range(counts.shape[0]):
+            for i in range(counts.shape[1]):
+                t = max(totals[i], 1)
+                for m in range(counts.shape[2]):
+                    out[s, i, m] = round(100.0 * counts[s, i, m] / t, 1)
+        return out
+
+
+def scan_bids(bids_root: Path, site_lookup: dict):
+    """Single pass over sub-*/ses-* feeding both the recruitment donuts and the modality cards.
+
+    Returns ``{"sessions": {key: {"sites": {site: n}, "total": n}},
+    "modalities": {suffix: {site_label: {modality: n_subjects, ..., "total": n_site_subjects}}},
+    "percents": {suffix: {site_label: {modality: percent}}}}``.
+    Modality totals are the site's participants.tsv headcount, so subjects without the
+    session count as missing.
+    """
+    sessions = {key: {"sites": Counter(), "total": 0} for key in SESSION_KEYS.values()}
+    by_site = defaultdict(list)  # lowercased site -> participant ids, built once
+    for sub_id, site in site_lookup.items():
+        by_site[str(site).lower()].append(sub_id)
+    site_labels = list(SITE_MAP.values())
+    site_idx_of = {label.lower(): i for i, label in enumerate(site_labels)}
+    n_sites, n_mods = len(site_labels), len(MODALITIES)
+    hits = array("i")  # flat (session, site, modality) index per modality hit
+    if bids_root.exists():
+        with os.scandir(bids_root) as it:
+            subjects = [e for e in it if e.name.startswith("sub-") and e.is_dir(follow_symlinks=False)]
+        site_of = {sub.name: site_lookup.get(sub.name, "Unknown") for sub in subjects}
+        # Directory reads release the GIL, so a thread per subject overlaps scandir latency.
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+            scanned = pool.map(
+                lambda sub: (sub.name, _scan_subject(sub.path, str(site_of[sub.name]).lower() in site_idx_of)),
+                subjects)
+            for sub_id, ses_hits in scanned:
+                site = site_of[sub_id]
+                site_idx = site_idx_of.get(str(site).lower())
+                for ses_name, found in ses_hits:
+                    key = SESSION_KEYS[ses_name]
+                    sessions[key]["total"] += 1
+                    sessions[key]["sites"][site] += 1
+                    if found is None:
+                        continue
+                    base = (SESSION_SUFFIXES.index(ses_name[len("ses-"):]) * n_sites + site_idx) * n_mods
+                    hits.extend(base + i for i, hit in enumerate(found) if hit)
+
+    counts = np.bincount(np.frombuffer(hits, dtype=np.intc),
+                         minlength=len(SESSION_SUFFIXES) * n_sites * n_mods)
+    counts = counts.reshape(len(SESSION_SUFFIXES), n_sites, n_mods)
+    totals = np.array([len(by_site.get(label.lower(), ())) for label in site_labels], dtype=np.int64)
+    percents = _percent_table(counts, totals).tolist()
+    counts = counts.tolist()
+    modalities = {
+        suffix: {label: {**dict(zip(MODALITIES, counts[s][i])), "total": int(totals[i])}
+                 for i, label in enumerate(site_labels)}
+        for s, suffix in enumerate(SESSION_SUFFIXES)
+    }
+    percent_summary = {
+        suffix: {label: dict(zip(MODALITIES, percents[s][i])) for i, label in enumerate(site_labels)}
+        for s, suffix in enumerate(SESSION_SUFFIXES)
+    }
+    return {"sessions": sessions, "modalities": modalities, "percents": percent_summary}
+
+
+def _mtime_ns(path: str):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def bids_signature(bids_root: Path) -> str:
+    """Cheap fingerprint of everything scan_bids() reads: participants.tsv and the
+    sub-*/ses-*/<datatype> directories.
+
+    A directory's mtime changes when entries are added, removed or renamed in it, so
+    stat()ing those directories (no file reads) catches new subjects, sessions and scans.
+    Only names relative to the root are hashed, so the same tree reached through another
+    path gives the same signature. Entries that are not ``sub-*`` do not take part.
+    """
+    root = str(bids_root)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(b"participants.tsv:%d\n" % _mtime_ns(os.path.join(root, "participants.tsv")))
+    try:
+        with os.scandir(root) as it:
+            subjects = sorted(e.name for e in it if e.name.startswith("sub-") and e.is_dir(follow_symlinks=False))
+    except OSError:
+        subjects = []
+    for sub in subjects:
+        sub_dir = os.path.join(root, sub)
+        h.update(b"%s:%d\n" % (os.fsencode(sub), _mtime_ns(sub_dir)))
+        for ses_name in SESSION_KEYS:
+            ses_dir = os.path.join(sub_dir, ses_name)
+            mtime = _mtime_ns(ses_dir)
+            if not mtime:
+                continue
+            h.update(b"%s/%s:%d\n" % (os.fsencode(sub), ses_name.encode(), mtime))
+            for datatype in sorted(_DATATYPE_DIRS):
+                h.update(b"%s/%s/%s:%d\n" % (os.fsencode(sub), ses_name.encode(), datatype.encode(),
+                                              _mtime_ns(os.path.join(ses_dir, datatype))))
+    return h.hexdigest()
+
+
+def cache_dir() -> Path:
+    """$FLUX_CACHE_DIR, else the user cache directory.
+
+    Kept outside the dataset: creating a directory in the dataset root would bump the
+    root's mtime, which the dashboard shows as "Last updated".
+    """
+    env = os.environ.get("FLUX_CACHE_DIR", "").strip()
+    if env:
+        return Path(env).expanduser()
+    base = os.environ.get("XDG_CACHE_HOME", "").strip() or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "flux-notebooks"
+
+
+def summary_path(dataset_root: Path) -> Path:
+    """Summary file for one dataset, named after its resolved root."""
+    key = hashlib.blake2b(os.fsencode(Path(dataset_root).resolve()), digest_size=8).hexdigest()
+    return cache_dir() / f"summary-{key}.json"
+
+
+def build_summary(bids_root: Path, signature: str | None = None):
+    """scan_bids() plus the bids_signature() the counts were taken at.
+
+    The signature is taken before scanning, so a change made mid-scan shows up as stale later.
+    """
+    bids_root = Path(bids_root)
+    if signature is None:
+        signature = bids_signature(bids_root)
+    scan = scan_bids(bids_root, load_site_lookup(bids_root / "participants.tsv"))
+    return {"version": SUMMARY_VERSION, "bids_signature": signature, **scan}
+
+
+def write_summary(dataset_root: Path, summary: dict) -> Path:
+    """Write the summary JSON atomically (temp file + rename) and return its path."""
+    path = summary_path(dataset_root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".summary-", suffix=".json", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(summary, f)
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600; the dashboard may run as another user
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
+
+
+def load_summary(dataset_root: Path, signature: str):
+    """The cached summary if it was built for this bids_signature(), else None."""
+    try:
+        with open(summary_path(dataset_root), encoding="utf-8") as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if summary.get("version") != SUMMARY_VERSION or summary.get("bids_signature") != signature:
+        return None
+    return summary
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Precompute the dashboard home-page summary for a dataset")
+    ap.add_argument("--dataset-root", default=os.environ.get("FLUX_DATASET_ROOT"),
+                    help="Dataset root (or set FLUX_DATASET_ROOT)")
+    args = ap.parse_args(argv)
+    if not args.dataset_root:
+        ap.error("--dataset-root is required when FLUX_DATASET_ROOT is not set")
+
+    dataset_root = Path(args.dataset_root).expanduser().resolve()
+    path = write_summary(dataset_root, build_summary(resolve_bids_root(dataset_root)))
+    print(f"[INFO] Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# src/flux_notebooks/cache/participants.py
+"""participants.tsv as read by the dashboard pages (MRIQC, fMRIPrep).
+
+The parsed table is cached on the file's mtime, so callbacks can call load_participants()
+on every request and still see new participants or site changes without a restart.
+"""
+from __future__ import annotations
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+_PARTICIPANT_COLS = ("participant_id", "site_name")
+
+
+def load_participants(path: Path):
+    """participants.tsv plus a lowercased ``site_name_lc`` column, or None if unusable.
+
+    The frame is shared between callers; treat it as read-only.
+    """
+    try:
+        mtime_ns = Path(path).stat().st_mtime_ns
+    except OSError:
+        return None
+    return _read_participants(str(path), mtime_ns)
+
+
+@lru_cache(maxsize=4)
+def _read_participants(path_str: str, mtime_ns: int):
+    try:
+        # Only the id and site columns are used; skip type inference on the rest.
+        df = pd.read_csv(
+            path_str, sep="\t", engine="c",
+            usecols=lambda c: c in _PARTICIPANT_COLS, dtype=str,
+        )
+    except Exception as e:
+        print(f"[WARN] Failed to read participants.tsv: {e}")
+        return None
+    if "site_name" not in df.columns or "participant_id" not in df.columns:
+        print("[WARN] participants.tsv missing required columns: 'site_name' or 'participant_id'")
+        return None
+    df["site_name_lc"] = df["site_name"].str.lower()
+    return df
+
+
+def load_site_subjects(path: Path):
+    """Lowercased site name -> sorted participant ids ({} if participants.tsv is unusable).
+
+    Cached on the same mtime as load_participants(); treat it as read-only.
+    """
+    try:
+        mtime_ns = Path(path).stat().st_mtime_ns
+    except OSError:
+        return {}
+    return _site_subjects(str(path), mtime_ns)
+
+
+@lru_cache(maxsize=4)
+def _site_subjects(path_str: str, mtime_ns: int):
+    df = _read_participants(path_str, mtime_ns)
+    if df is None:
+        return {}
+    site_to_subs = defaultdict(set)
+    for sub, site in zip(df["participant_id"], df["site_name_lc"]):
+        site_to_subs[site].add(sub)
+    return {site: sorted(subs) for site, subs in site_to_subs.items()}
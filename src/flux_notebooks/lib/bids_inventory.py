@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from flux_notebooks.config import Settings
 import re 
@@ -12,27 +13,33 @@ PROJECT_MAP = {
 }
 
 
+def _json_names(dir_path: str):
+    """Names of the JSON sidecars directly inside dir_path ([] if it does not exist)."""
+    try:
+        with os.scandir(dir_path) as it:
+            return [e.name for e in it if e.name.endswith(".json")]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
 def summarize_subject_inventory(sub_id: str):
     """Return high-level info about what data exists for this subject."""
     sub_path = DATA_ROOT / sub_id
     if not sub_path.exists():
         return {"Sessions": "—", "Acquisitions": "—", "Tasks": "—", "Echoes": "—"}
 
-    sessions = sorted([p.name for p in sub_path.glob("ses-*") if p.is_dir()])
+    with os.scandir(sub_path) as it:
+        sessions = sorted(e.name for e in it if e.name.startswith("ses-") and e.is_dir(follow_symlinks=False))
     n_sessions = len(sessions)
 
     acquisitions = set()
     tasks = set()
     echo_counts = {}
 
+    # One directory read per session datatype folder; missing folders are simply skipped.
     for ses in sessions:
-        ses_dir = sub_path / ses
         for mod in ["anat", "func", "dwi"]:
-            mod_dir = ses_dir / mod
-            if not mod_dir.exists():
-                continue
-            for f in mod_dir.glob("*.json"):
-                fname = f.name
+            for fname in _json_names(os.path.join(sub_path, ses, mod)):
                 if "_T1w" in fname:
                     acquisitions.add("T1w")
                 elif "_bold" in fname:
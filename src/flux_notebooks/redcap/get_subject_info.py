@@ -11,6 +11,8 @@ Priority of data sources:
 Caregiver self fields (demo_cg_*) are ignored.
 """
 
+import csv
+import os
 from pathlib import Path
 import pandas as pd
 from flux_notebooks.config import Settings
@@ -229,15 +231,28 @@ def get_subject_list(site: str = None) -> list[str]:
         print(f"[BIDS] Dataset root not found: {BIDS_ROOT}")
         return []
 
-    subs = sorted([p.name for p in BIDS_ROOT.glob("sub-*") if p.is_dir()])
+    # DirEntry.is_dir() reuses the type readdir already returned; no per-subject stat.
+    with os.scandir(BIDS_ROOT) as it:
+        subs = sorted(e.name for e in it if e.name.startswith("sub-") and e.is_dir())
 
     if site:
         participants_file = BIDS_ROOT / "participants.tsv"
         if participants_file.exists():
-            df = pd.read_csv(participants_file, sep="\t", dtype=str).fillna("")
-            if "site_name" in df.columns and "participant_id" in df.columns:
-                df_site = df[df["site_name"].str.lower() == site.lower()]
-                subs = sorted(df_site["participant_id"].tolist())
+            # Two columns of a small TSV: the csv module is far cheaper than a DataFrame here.
+            # utf-8-sig: a BOM would otherwise stick to the first column name
+            with open(participants_file, newline="", encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f, delimiter="\t")
+                missing = {"site_name", "participant_id"} - set(reader.fieldnames or ())
+                if missing:
+                    print(f"[WARN] {participants_file} has no {', '.join(sorted(missing))} column; "
+                          "not filtering by site")
+                else:
+                    site_lc = site.lower()
+                    subs = sorted(
+                        row["participant_id"] or ""
+                        for row in reader
+                        if (row["site_name"] or "").lower() == site_lc
+                    )
 
     print(f"[BIDS] Found {len(subs)} subjects (site={site or 'all'})")
     return subs
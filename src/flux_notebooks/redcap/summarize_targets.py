@@ -129,29 +129,29 @@ def summarize_modalities(bids_root: Path, derivatives_root: Path):
     # Labels we will emit for tasks
     task_labels = [f"task-{t}" for t in task_names]
 
+    # One query for every relevant NIfTI, reduced to the (subject, label) pairs present
+    display_of = {suffix: disp for disp, suffix in BASE_SUFFIX.items()}
+    task_set = set(task_names)
+    present = set()
+    for f in layout.get(suffix=list(BASE_SUFFIX.values()) + ["bold"], extension=[".nii", ".nii.gz"]):
+        ents = f.entities
+        subj = ents.get("subject")
+        if ents.get("suffix") == "bold":
+            if ents.get("task") in task_set:
+                present.add((subj, f"task-{ents['task']}"))
+        else:
+            present.add((subj, display_of[ents["suffix"]]))
+
     summaries = {}
 
     for site, subjects in site_subjects.items():
         n_site = max(len(subjects), 1)  # avoid /0
 
-        # Initialize counts per *display* label
-        available_counts = {k: 0 for k in BASE_SUFFIX.keys()}
-        for lbl in task_labels:
-            available_counts[lbl] = 0
-
         # Count availability per subject (once per subject per modality)
-        for subj in subjects:
-            # Struct/DWI
-            for disp, suffix in BASE_SUFFIX.items():
-                has = bool(layout.get(subject=subj, suffix=suffix, extension=[".nii", ".nii.gz"]))
-                if has:
-                    available_counts[disp] += 1
-
-            # Tasks (emit exact label)
-            for t in task_names:
-                has = bool(layout.get(subject=subj, task=t, suffix="bold", extension=[".nii", ".nii.gz"]))
-                if has:
-                    available_counts[f"task-{t}"] += 1
+        available_counts = {
+            disp: sum((subj, disp) in present for subj in subjects)
+            for disp in list(BASE_SUFFIX.keys()) + task_labels
+        }
 
         # Build summary list
         site_summary = []
@@ -0,0 +1,121 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from flux_notebooks.cache import build_summary as bs
+
+
+def _touch(path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+
+
+def _bump_mtime(path: Path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setenv("FLUX_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def bids_root(tmp_path: Path) -> Path:
+    root = tmp_path / "bids"
+    root.mkdir()
+    (root / "dataset_description.json").write_text("{}")
+    # BOM on purpose: some sites export participants.tsv from Excel.
+    (root / "participants.tsv").write_text(
+        "\ufeffparticipant_id\tsite_name\n"
+        "sub-01\tMontreal\n"
+        "sub-02\tMontreal\n"
+        "sub-03\tCalgary\n"
+        "sub-04\tToronto\n",
+        encoding="utf-8",
+    )
+    _touch(root / "sub-01/ses-1a/anat/sub-01_ses-1a_T1w.nii.gz")
+    _touch(root / "sub-01/ses-1a/anat/sub-01_ses-1a_T1w.json")
+    _touch(root / "sub-01/ses-1a/anat/sub-01_ses-1a_T2w.nii.gz")
+    _touch(root / "sub-01/ses-1a/func/sub-01_ses-1a_task-laluna_bold.nii.gz")
+    _touch(root / "sub-01/ses-2a/anat/sub-01_ses-2a_T1w.nii.gz")
+    _touch(root / "sub-02/ses-1a/anat/sub-02_ses-1a_T1w.nii.gz")
+    _touch(root / "sub-02/ses-1a/dwi/sub-02_ses-1a_dwi.nii.gz")
+    _touch(root / "sub-03/ses-1a/func/sub-03_ses-1a_task-partlycloudy_bold.nii.gz")
+    _touch(root / "sub-99/ses-1a/anat/sub-99_ses-1a_T1w.nii.gz")  # not in participants.tsv
+    return root
+
+
+def test_scan_bids_sessions_and_percents(bids_root: Path):
+    scan = bs.scan_bids(bids_root, bs.load_site_lookup(bids_root / "participants.tsv"))
+
+    sessions = scan["sessions"]
+    assert sessions["baseline"]["total"] == 4
+    assert dict(sessions["baseline"]["sites"]) == {"Montreal": 2, "Calgary": 1, "Unknown": 1}
+    assert sessions["followup1"]["total"] == 1
+    assert dict(sessions["followup1"]["sites"]) == {"Montreal": 1}
+    assert sessions["followup2"]["total"] == 0
+
+    # Percent of the site's participants.tsv headcount, so sub-04 (no data) counts as missing.
+    pct = scan["percents"]
+    assert pct["1a"]["Montreal"] == {"T1W": 100.0, "T2W": 50.0, "task-partlycloudy": 0.0,
+                                     "task-laluna": 50.0, "DWI": 50.0}
+    assert pct["1a"]["Calgary"] == {"T1W": 0.0, "T2W": 0.0, "task-partlycloudy": 100.0,
+                                    "task-laluna": 0.0, "DWI": 0.0}
+    assert set(pct["1a"]["Toronto"].values()) == {0.0}
+    assert pct["2a"]["Montreal"]["T1W"] == 50.0
+    assert set(pct["3a"]["Montreal"].values()) == {0.0}
+    assert scan["modalities"]["1a"]["Montreal"]["total"] == 2
+    assert scan["modalities"]["1a"]["Montreal"]["T1W"] == 2
+
+
+def test_build_summary_write_load_round_trip(bids_root: Path, cache_dir: Path):
+    summary = bs.build_summary(bids_root)
+    assert summary["version"] == bs.SUMMARY_VERSION
+    assert summary["bids_signature"] == bs.bids_signature(bids_root)
+
+    path = bs.write_summary(bids_root, summary)
+    assert path == bs.summary_path(bids_root)
+    assert path.parent == cache_dir
+    assert list(cache_dir.iterdir()) == [path]  # no temp files left
+    assert bs.load_summary(bids_root, summary["bids_signature"]) == json.loads(json.dumps(summary))
+
+
+def test_load_summary_rejects_stale(bids_root: Path):
+    summary = bs.build_summary(bids_root)
+    sig = summary["bids_signature"]
+
+    assert bs.load_summary(bids_root, sig) is None  # nothing written yet
+    bs.write_summary(bids_root, summary)
+    assert bs.load_summary(bids_root, "other-signature") is None
+    bs.write_summary(bids_root, {**summary, "version": bs.SUMMARY_VERSION - 1})
+    assert bs.load_summary(bids_root, sig) is None
+    bs.summary_path(bids_root).write_text("{not json")
+    assert bs.load_summary(bids_root, sig) is None
+
+
+def test_write_summary_leaves_dataset_untouched(bids_root: Path):
+    # The dashboard shows the dataset root's mtime as "Last updated".
+    os.utime(bids_root, ns=(0, 1_577_836_800_000_000_000))  # 2020-01-01
+    sig = bs.bids_signature(bids_root)
+    bs.write_summary(bids_root, bs.build_summary(bids_root, sig))
+    assert bids_root.stat().st_mtime_ns == 1_577_836_800_000_000_000
+    assert bs.bids_signature(bids_root) == sig
+    assert bs.load_summary(bids_root, sig) is not None
+
+
+@pytest.mark.parametrize("change", ["session", "scan", "participants"])
+def test_signature_tracks_changes(bids_root: Path, change: str):
+    sig = bs.bids_signature(bids_root)
+    if change == "session":
+        (bids_root / "sub-01/ses-3a").mkdir()
+    elif change == "scan":
+        anat = bids_root / "sub-02/ses-1a/anat"
+        _touch(anat / "sub-02_ses-1a_T2w.nii.gz")
+        _bump_mtime(anat)  # coarse-mtime filesystems
+    else:
+        _bump_mtime(bids_root / "participants.tsv")
+    assert bs.bids_signature(bids_root) != sig